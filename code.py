@@ -1,10 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
+import queue
+import threading
 from datetime import datetime
 from pulp import LpProblem, LpVariable, LpMinimize, LpStatus, lpSum
 import pandas as pd
 
+# Number of time slots spelled out in the Time Slots summary label
+SUMMARY_PREVIEW_SLOTS = 5
+# JSON view streaming: characters per chunk, chunks buffered ahead, poll delay (ms)
+JSON_CHUNK_CHARS = 64 * 1024
+JSON_QUEUE_CHUNKS = 8
+JSON_POLL_MS = 5
+# Soft constraints: every one adds a weighted cost to a placement, the cheapest placement wins
+CONSTRAINT_TYPES = ['Prefer early in the day', 'Prefer late in the day', 'Prefer day', 'Avoid day', 'Balance resource load', 'Avoid gaps between meetings', 'No preference']
+ALL_EVENTS = 'All events'
+# Costs closer than this are equal (prefix sums of fractions pick up rounding errors)
+COST_EPSILON = 1e-9
+
 class ScheduleGeneratorApp:
     def __init__(self, root):
         self.root = root
@@ -150,6 +164,7 @@ class ScheduleGeneratorApp:
         self.resources_tree.column('Type', width=120)
         self.resources_tree.column('Availability', width=250)
         self.resources_tree.pack(fill='both', expand=True, padx=10, pady=10)
+        self.resource_by_iid = {}  # Table row id -> resource, used as the resource key across tabs
 
     def setup_events_tab(self):
         # Header
@@ -164,13 +179,25 @@ class ScheduleGeneratorApp:
         ttk.Label(form_frame, text="Duration (hours):").grid(row=1, column=0, padx=5, pady=5, sticky='e')
         self.event_duration_var = tk.DoubleVar()
         ttk.Entry(form_frame, textvariable=self.event_duration_var, width=10).grid(row=1, column=1, padx=5, pady=5)
-        # Resource selection (checkboxes)
+        # Resource selection (searchable list, Tk only draws the visible rows)
         ttk.Label(form_frame, text="Required resources:").grid(row=2, column=0, padx=5, pady=5, sticky='ne')
-        self.resource_checkbox_vars = []
-        self.resource_checkbox_widgets = []
-        self.resources_checkbox_frame = ttk.Frame(form_frame)
-        self.resources_checkbox_frame.grid(row=2, column=1, padx=5, pady=5, sticky='w')
-        self.update_event_resources_checkboxes()
+        picker_frame = ttk.Frame(form_frame)
+        picker_frame.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+        self.resource_search_var = tk.StringVar()
+        self.resource_search_var.trace_add('write', lambda *args: self.filter_resource_picker())
+        ttk.Entry(picker_frame, textvariable=self.resource_search_var, width=30).grid(row=0, column=0, columnspan=2, pady=(0, 2), sticky='w')
+        self.resource_picker_list = tk.Listbox(picker_frame, selectmode='multiple', exportselection=False, height=6, width=40, font=('Segoe UI', 9))
+        picker_scrollbar = ttk.Scrollbar(picker_frame, orient='vertical', command=self.resource_picker_list.yview)
+        self.resource_picker_list.configure(yscrollcommand=picker_scrollbar.set)
+        self.resource_picker_list.grid(row=1, column=0, sticky='w')
+        picker_scrollbar.grid(row=1, column=1, sticky='ns')
+        self.resource_picker_list.bind('<<ListboxSelect>>', self.on_resource_picker_select)
+        self.resource_picker_hint = ttk.Label(picker_frame, font=('Segoe UI', 10, 'italic'))
+        self.resource_picker_hint.grid(row=2, column=0, columnspan=2, sticky='w')
+        self.picker_iids = []  # Resource keys of the rows currently shown in the list, in display order
+        self.picker_shown = set()
+        self.selected_resources = {}  # Resource key -> resource, in selection order
+        self.update_resource_picker_hint()
         # Display of selected resources availability
         ttk.Label(form_frame, text="Availability of selected resources:").grid(row=3, column=0, padx=5, pady=5, sticky='ne')
         self.availability_resources_text = tk.Text(form_frame, height=4, width=40, font=('Segoe UI', 9), bg='#e3f2fd')
@@ -199,23 +226,40 @@ class ScheduleGeneratorApp:
         # Form
         form_frame = ttk.Frame(self.frame_constraints)
         form_frame.pack(pady=10)
-        ttk.Label(form_frame, text="Placement preference:").grid(row=0, column=0, padx=5, pady=5, sticky='e')
+        ttk.Label(form_frame, text="Constraint:").grid(row=0, column=0, padx=5, pady=5, sticky='e')
         self.constraint_type_var = tk.StringVar()
-        types = ['Prefer early in the day', 'Prefer late in the day', 'No preference']
-        ttk.Combobox(form_frame, textvariable=self.constraint_type_var, values=types, width=30).grid(row=0, column=1, padx=5, pady=5)
+        ttk.Combobox(form_frame, textvariable=self.constraint_type_var, values=CONSTRAINT_TYPES, width=30, state='readonly').grid(row=0, column=1, padx=5, pady=5)
+        ttk.Label(form_frame, text="Applies to (event or resource):").grid(row=1, column=0, padx=5, pady=5, sticky='e')
+        self.constraint_target_var = tk.StringVar(value=ALL_EVENTS)
+        self.constraint_target_combo = ttk.Combobox(form_frame, textvariable=self.constraint_target_var, width=30, postcommand=self.update_constraint_targets)
+        self.constraint_target_combo.grid(row=1, column=1, padx=5, pady=5)
+        ttk.Label(form_frame, text="Day (day preferences only):").grid(row=2, column=0, padx=5, pady=5, sticky='e')
+        self.constraint_day_var = tk.StringVar()
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+        ttk.Combobox(form_frame, textvariable=self.constraint_day_var, values=days, width=15, state='readonly').grid(row=2, column=1, padx=5, pady=5, sticky='w')
+        ttk.Label(form_frame, text="Weight:").grid(row=3, column=0, padx=5, pady=5, sticky='e')
+        self.constraint_weight_var = tk.DoubleVar(value=1.0)
+        ttk.Entry(form_frame, textvariable=self.constraint_weight_var, width=10).grid(row=3, column=1, padx=5, pady=5, sticky='w')
         # Help message
-        self.constraint_help_label = ttk.Label(form_frame, text="This preference will be applied to all events during schedule generation.", foreground='#1976d2', font=('Segoe UI', 9, 'italic'))
-        self.constraint_help_label.grid(row=1, column=0, columnspan=2, padx=5, pady=5)
+        self.constraint_help_label = ttk.Label(form_frame, text="Constraints are preferences: each one adds a weighted cost and the cheapest placement is kept.", foreground='#1976d2', font=('Segoe UI', 9, 'italic'))
+        self.constraint_help_label.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
         # Buttons
         btn_frame = ttk.Frame(self.frame_constraints)
         btn_frame.pack(pady=10)
         ttk.Button(btn_frame, text="Add Constraint", command=self.add_constraint).pack(side='left', padx=5)
         ttk.Button(btn_frame, text="Delete Selection", command=self.delete_constraint).pack(side='left', padx=5)
         # Table
-        self.constraints_tree = ttk.Treeview(self.frame_constraints, columns=('Type',), show='headings')
-        self.constraints_tree.heading('Type', text='Placement Preference')
-        self.constraints_tree.column('Type', width=300)
+        self.constraints_tree = ttk.Treeview(self.frame_constraints, columns=('Type', 'Target', 'Day', 'Weight'), show='headings')
+        self.constraints_tree.heading('Type', text='Constraint')
+        self.constraints_tree.heading('Target', text='Applies to')
+        self.constraints_tree.heading('Day', text='Day')
+        self.constraints_tree.heading('Weight', text='Weight')
+        self.constraints_tree.column('Type', width=250)
+        self.constraints_tree.column('Target', width=180)
+        self.constraints_tree.column('Day', width=100)
+        self.constraints_tree.column('Weight', width=80)
         self.constraints_tree.pack(fill='both', expand=True, padx=10, pady=10)
+        self.constraint_by_iid = {}  # Table row id -> constraint
 
     def setup_results_tab(self):
         # Header
@@ -248,6 +292,7 @@ class ScheduleGeneratorApp:
         scrollbar.pack(side='right', fill='y')
         self.json_text.pack(fill='both', expand=True, padx=10, pady=10)
         self.json_text.pack_forget()  # Hidden by default
+        self.json_cancel = threading.Event()  # Set to stop the JSON stream in progress
         # Calendar canvas (hidden by default)
         self.cal_canvas = tk.Canvas(self.frame_results, width=900, height=400, bg='#f5f7fa', highlightthickness=0)
         self.cal_canvas.pack(pady=10)
@@ -282,7 +327,10 @@ class ScheduleGeneratorApp:
         if n == 0:
             self.summary_timeslots_label.config(text="No time slots added yet.")
         else:
-            summary = ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in self.generator.timeslots])
+            # Only the first few slots are spelled out so the label stays cheap to rebuild
+            summary = ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in self.generator.timeslots[:SUMMARY_PREVIEW_SLOTS]])
+            if n > SUMMARY_PREVIEW_SLOTS:
+                summary += f", ... (+{n - SUMMARY_PREVIEW_SLOTS} more)"
             self.summary_timeslots_label.config(text=f"You have added {n} time slot(s): {summary}")
 
     def add_availability_slot(self):
@@ -312,59 +360,108 @@ class ScheduleGeneratorApp:
         if not name or not type_ or not self.resource_slots:
             messagebox.showerror("Error", "Please fill all fields and add at least one availability slot.")
             return
-        self.generator.resources.append({'name': name, 'type': type_, 'availability': list(self.resource_slots)})
+        resource = {'name': name, 'type': type_, 'availability': list(self.resource_slots)}
+        self.generator.resources.append(resource)
         availability_str = ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in self.resource_slots])
-        self.resources_tree.insert('', 'end', values=(name, type_, availability_str))
+        iid = self.resources_tree.insert('', 'end', values=(name, type_, availability_str))
+        self.resource_by_iid[iid] = resource
         self.resource_name_var.set('')
         self.resource_type_var.set('')
         self.resource_slots.clear()
         for i in self.availability_slots_tree.get_children():
             self.availability_slots_tree.delete(i)
-        # Update resource list in events tab
-        if hasattr(self, 'update_event_resources_checkboxes'):
-            self.update_event_resources_checkboxes()
+        # Update resource list in events tab (only the new row)
+        self.add_resource_to_picker(iid)
 
     def delete_resource(self):
         selected = self.resources_tree.selection()
         for item in selected:
-            values = self.resources_tree.item(item, 'values')
-            self.generator.resources = [r for r in self.generator.resources if not (r['name'] == values[0] and r['type'] == values[1] and ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in r['availability']]) == values[2])]
+            resource = self.resource_by_iid.pop(item)
+            self.generator.resources.remove(resource)
             self.resources_tree.delete(item)
-        # Update resource list in events tab
-        if hasattr(self, 'update_event_resources_checkboxes'):
-            self.update_event_resources_checkboxes()
-
-    def update_event_resources_checkboxes(self):
-        # Clear old checkboxes
-        for widget in getattr(self, 'resource_checkbox_widgets', []):
-            widget.destroy()
-        self.resource_checkbox_vars = []
-        self.resource_checkbox_widgets = []
-        # Add a checkbox for each resource
-        if not self.generator.resources:
-            label = ttk.Label(self.resources_checkbox_frame, text="Add resources first in the Resources tab.", foreground='#d32f2f', font=('Segoe UI', 10, 'italic'))
-            label.grid(row=0, column=0, sticky='w')
-            self.resource_checkbox_widgets.append(label)
+            # Update resource list in events tab (only the removed row)
+            self.remove_resource_from_picker(item)
+        self.remove_orphaned_constraints()
+
+    # --- Resource picker (Meetings/Events tab) ---
+    def resource_label(self, r):
+        return f"{r['name']} ({r['type']})"
+
+    def resource_matches_search(self, r):
+        query = self.resource_search_var.get().strip().lower()
+        return query in self.resource_label(r).lower()
+
+    def filter_resource_picker(self):
+        # Rebuild the rows from the search query; selections outside the filter are kept
+        self.picker_iids = [iid for iid, r in self.resource_by_iid.items() if self.resource_matches_search(r)]
+        self.picker_shown = set(self.picker_iids)
+        self.resource_picker_list.delete(0, tk.END)
+        if self.picker_iids:
+            self.resource_picker_list.insert(tk.END, *[self.resource_label(self.resource_by_iid[iid]) for iid in self.picker_iids])
+        for idx, iid in enumerate(self.picker_iids):
+            if iid in self.selected_resources:
+                self.resource_picker_list.selection_set(idx)
+
+    def add_resource_to_picker(self, iid):
+        r = self.resource_by_iid[iid]
+        if self.resource_matches_search(r):
+            self.resource_picker_list.insert(tk.END, self.resource_label(r))
+            self.picker_iids.append(iid)
+            self.picker_shown.add(iid)
+        self.update_resource_picker_hint()
+
+    def remove_resource_from_picker(self, iid):
+        if iid in self.picker_shown:
+            idx = self.picker_iids.index(iid)
+            self.resource_picker_list.delete(idx)
+            del self.picker_iids[idx]
+            self.picker_shown.discard(iid)
+        if iid in self.selected_resources:
+            del self.selected_resources[iid]
+            self.hide_resource_availability(iid)
+        self.update_resource_picker_hint()
+
+    def on_resource_picker_select(self, event=None):
+        # Diff the visible selection against the stored one and only touch what changed
+        now_selected = {self.picker_iids[idx] for idx in self.resource_picker_list.curselection()}
+        was_selected = {iid for iid in self.selected_resources if iid in self.picker_shown}
+        for iid in was_selected - now_selected:
+            del self.selected_resources[iid]
+            self.hide_resource_availability(iid)
+        for iid in now_selected - was_selected:
+            self.selected_resources[iid] = self.resource_by_iid[iid]
+            self.show_resource_availability(iid)
+        self.update_resource_picker_hint()
+
+    def update_resource_picker_hint(self):
+        if not self.resource_by_iid:
+            self.resource_picker_hint.config(text="Add resources first in the Resources tab.", foreground='#d32f2f')
         else:
-            for idx, r in enumerate(self.generator.resources):
-                var = tk.BooleanVar()
-                cb = ttk.Checkbutton(self.resources_checkbox_frame, text=f"{r['name']} ({r['type']})", variable=var, command=self.show_selected_resources_availability)
-                cb.grid(row=idx, column=0, sticky='w')
-                self.resource_checkbox_vars.append(var)
-                self.resource_checkbox_widgets.append(cb)
-
-    def show_selected_resources_availability(self):
-        self.availability_resources_text.delete('1.0', tk.END)
-        for idx, var in enumerate(self.resource_checkbox_vars):
-            if var.get():
-                r = self.generator.resources[idx]
-                availability = ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in r['availability']])
-                self.availability_resources_text.insert(tk.END, f"{r['name']}: {availability}\n")
+            self.resource_picker_hint.config(text=f"{len(self.selected_resources)} of {len(self.resource_by_iid)} resource(s) selected.", foreground='#388e3c')
+
+    def show_resource_availability(self, iid):
+        # Each resource gets its own line, tagged with its key so it can be removed alone
+        r = self.resource_by_iid[iid]
+        availability = ", ".join([f"{c['day']} {c['start']}-{c['end']}" for c in r['availability']])
+        self.availability_resources_text.insert(tk.END, f"{r['name']}: {availability}\n", (iid,))
+
+    def hide_resource_availability(self, iid):
+        ranges = self.availability_resources_text.tag_ranges(iid)
+        if ranges:
+            self.availability_resources_text.delete(ranges[0], ranges[1])
+        self.availability_resources_text.tag_delete(iid)
+
+    def clear_resource_selection(self):
+        for iid in self.selected_resources:
+            self.hide_resource_availability(iid)
+        self.selected_resources.clear()
+        self.resource_picker_list.selection_clear(0, tk.END)
+        self.update_resource_picker_hint()
 
     def add_event(self):
         name = self.event_name_var.get()
         duration = self.event_duration_var.get()
-        resources = [self.generator.resources[i]['name'] for i, var in enumerate(self.resource_checkbox_vars) if var.get()]
+        resources = [r['name'] for r in self.selected_resources.values()]
         if not name or not duration or not resources:
             messagebox.showerror("Error", "Please fill all fields and select at least one resource.")
             return
@@ -372,9 +469,7 @@ class ScheduleGeneratorApp:
         self.events_tree.insert('', 'end', values=(name, duration, ", ".join(resources), ""))
         self.event_name_var.set('')
         self.event_duration_var.set(0)
-        for var in self.resource_checkbox_vars:
-            var.set(False)
-        self.availability_resources_text.delete('1.0', tk.END)
+        self.clear_resource_selection()
 
     def delete_event(self):
         selected = self.events_tree.selection()
@@ -382,23 +477,62 @@ class ScheduleGeneratorApp:
             values = self.events_tree.item(item, 'values')
             self.generator.events = [e for e in self.generator.events if not (e['name'] == values[0] and str(e['duration']) == str(values[1]))]
             self.events_tree.delete(item)
+        self.remove_orphaned_constraints()
+
+    def update_constraint_targets(self):
+        # Filled when the list is opened, so adding events/resources costs nothing here
+        names = [e['name'] for e in self.generator.events] + [r['name'] for r in self.generator.resources]
+        self.constraint_target_combo['values'] = [ALL_EVENTS] + list(dict.fromkeys(names))
 
     def add_constraint(self):
         type_ = self.constraint_type_var.get()
+        target = self.constraint_target_var.get() or ALL_EVENTS
+        day = self.constraint_day_var.get() if type_ in ('Prefer day', 'Avoid day') else ''
         if not type_:
-            messagebox.showerror("Error", "Please choose a placement preference.")
+            messagebox.showerror("Error", "Please choose a constraint.")
+            return
+        # A target matching no event or resource would be silently ignored by the generator
+        names = {e['name'] for e in self.generator.events} | {r['name'] for r in self.generator.resources}
+        if target != ALL_EVENTS and target not in names:
+            messagebox.showerror("Error", f"'{target}' is not an existing meeting/event or resource.")
             return
-        self.generator.constraints.append({'type': type_})
-        self.constraints_tree.insert('', 'end', values=(type_,))
+        if type_ in ('Prefer day', 'Avoid day') and not day:
+            messagebox.showerror("Error", "Please choose the day for this preference.")
+            return
+        try:
+            weight = self.constraint_weight_var.get()
+        except tk.TclError:
+            weight = 0
+        if weight <= 0:
+            messagebox.showerror("Error", "Weight must be a positive number.")
+            return
+        constraint = {'type': type_, 'target': target, 'day': day, 'weight': weight}
+        self.generator.constraints.append(constraint)
+        iid = self.constraints_tree.insert('', 'end', values=(type_, target, day, weight))
+        self.constraint_by_iid[iid] = constraint
         self.constraint_type_var.set('')
+        self.constraint_target_var.set(ALL_EVENTS)
+        self.constraint_day_var.set('')
+        self.constraint_weight_var.set(1.0)
 
     def delete_constraint(self):
         selected = self.constraints_tree.selection()
         for item in selected:
-            values = self.constraints_tree.item(item, 'values')
-            self.generator.constraints = [c for c in self.generator.constraints if c['type'] != values[0]]
+            self.generator.constraints.remove(self.constraint_by_iid.pop(item))
             self.constraints_tree.delete(item)
 
+    def remove_orphaned_constraints(self):
+        # A constraint whose target is gone would be ignored, or attach to a later event/resource reusing the name
+        names = {e['name'] for e in self.generator.events} | {r['name'] for r in self.generator.resources}
+        removed = []
+        for iid, constraint in list(self.constraint_by_iid.items()):
+            if constraint['target'] != ALL_EVENTS and constraint['target'] not in names:
+                self.generator.constraints.remove(self.constraint_by_iid.pop(iid))
+                self.constraints_tree.delete(iid)
+                removed.append(f"{constraint['type']} ({constraint['target']})")
+        if removed:
+            messagebox.showinfo("Constraints removed", "These constraints applied to a deleted meeting/event or resource and were removed:\n" + "\n".join(removed))
+
     def generate_schedule(self):
         results, alerts = self.generator.generate()
         for i in self.results_tree.get_children():
@@ -406,6 +540,7 @@ class ScheduleGeneratorApp:
         for r in results:
             self.results_tree.insert('', 'end', values=(r['event'], r['day'], r['start'], r['end'], r['resource']))
         self.results = results
+        self.cancel_json_stream()
         self.json_text.pack_forget()
         self.cal_canvas.pack_forget() if hasattr(self, 'cal_canvas') else None
         if alerts:
@@ -425,12 +560,68 @@ class ScheduleGeneratorApp:
         if not hasattr(self, 'results') or not self.results:
             messagebox.showerror("Error", "No results to display.")
             return
+        self.cancel_json_stream()
         self.json_text.delete('1.0', tk.END)
-        self.json_text.insert(tk.END, json.dumps(self.results, indent=2, ensure_ascii=False))
         self.json_text.pack(fill='both', expand=True, padx=10, pady=10)
+        # Serialize in a background thread; the UI thread only inserts finished chunks
+        self.json_cancel = threading.Event()
+        chunks = queue.Queue(maxsize=JSON_QUEUE_CHUNKS)
+        threading.Thread(target=self.serialize_json_chunks, args=(self.results, chunks, self.json_cancel), daemon=True).start()
+        self.root.after(JSON_POLL_MS, self.insert_json_chunks, chunks, self.json_cancel)
+
+    def cancel_json_stream(self):
+        self.json_cancel.set()
+
+    def serialize_json_chunks(self, results, chunks, cancel):
+        # Runs in a worker thread: must not touch any Tk widget
+        buffer = []
+        size = 0
+        try:
+            for piece in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(results):
+                buffer.append(piece)
+                size += len(piece)
+                if size >= JSON_CHUNK_CHARS:
+                    if not self.put_json_chunk(chunks, cancel, "".join(buffer)):
+                        return
+                    buffer = []
+                    size = 0
+        except Exception as e:
+            # Hand the error to the UI thread instead of dying silently
+            self.put_json_chunk(chunks, cancel, e)
+            return
+        if buffer and not self.put_json_chunk(chunks, cancel, "".join(buffer)):
+            return
+        self.put_json_chunk(chunks, cancel, None)  # End of stream
+
+    def put_json_chunk(self, chunks, cancel, chunk):
+        # The queue is bounded so serialization never runs far ahead of the display
+        while not cancel.is_set():
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def insert_json_chunks(self, chunks, cancel):
+        if cancel.is_set():
+            return
+        try:
+            chunk = chunks.get_nowait()
+        except queue.Empty:
+            self.root.after(JSON_POLL_MS, self.insert_json_chunks, chunks, cancel)
+            return
+        if chunk is None:
+            return
+        if isinstance(chunk, Exception):
+            messagebox.showerror("Error", f"Unable to display JSON: {chunk}")
+            return
+        self.json_text.insert(tk.END, chunk)
+        self.root.after(JSON_POLL_MS, self.insert_json_chunks, chunks, cancel)
 
     def show_calendar(self):
         # Hide JSON
+        self.cancel_json_stream()
         self.json_text.pack_forget()
         # Clear canvas
         self.cal_canvas.delete('all')
@@ -481,7 +672,8 @@ class ScheduleGenerator:
         self.constraints = []
 
     def generate(self):
-        # Generation: assign each event to consecutive slots where all resources are available
+        # Generation: assign each event to consecutive slots where all resources are available,
+        # choosing among them the one with the lowest soft-constraint cost
         results = []
         alerts = []
         used_slots = set()
@@ -498,26 +690,37 @@ class ScheduleGenerator:
                     'end': f"{h+1:02d}:00"
                 })
         
-        # Determine placement preference
-        preference = "none"
-        if self.constraints:
-            constraint = self.constraints[0]['type']
-            if "early" in constraint:
-                preference = "early"
-            elif "late" in constraint:
-                preference = "late"
+        # Per 1-hour slot cost tables, computed once for the whole generation
+        tables = self.build_slot_tables(slots_1h)
+        # State for the resource constraints, updated after each placement
+        load = {}  # (resource, day) -> hours already booked
+        bookings = {}  # (resource, day) -> list of booked (start, end) hours
+        gap_tables = {}  # resource -> per slot distance in hours to its nearest booking that day
         
         for evt in self.events:
             event_duration = int(evt['duration'])  # Duration in hours
             found = False
-            candidates = []
+            best = None
+            best_cost = None
+            
+            # Prefix sums of this event's slot costs: any window is scored with one subtraction
+            cost_prefix = self.event_cost_prefix(evt, tables)
+            load_weights = self.event_resource_weights(evt, 'Balance resource load')
+            gap_weights = self.event_resource_weights(evt, 'Avoid gaps between meetings')
             
             # Look for consecutive slots of the required duration
             for i in range(len(slots_1h) - event_duration + 1):
                 consecutive_slots = slots_1h[i:i+event_duration]
                 
+                # Slots are only consecutive if each one starts, on the same day, when the previous one ends
+                ok = all(
+                    nxt['day'] == prev['day'] and int(nxt['start'].split(':')[0]) == int(prev['end'].split(':')[0])
+                    for prev, nxt in zip(consecutive_slots, consecutive_slots[1:])
+                )
+                if not ok:
+                    continue
+                
                 # Check that all consecutive slots are available for all resources
-                ok = True
                 for slot in consecutive_slots:
                     for resource_name in evt['resources']:
                         r = next((r for r in self.resources if r['name'] == resource_name), None)
@@ -549,22 +752,28 @@ class ScheduleGenerator:
                             ok = False
                             break
                 
-                if ok:
-                    candidates.append(consecutive_slots)
-            
-            # Choose the best candidate according to preference
-            if candidates:
-                if preference == "early":
-                    # Take the first candidate (earliest)
-                    consecutive_slots = candidates[0]
-                elif preference == "late":
-                    # Take the last candidate (latest)
-                    consecutive_slots = candidates[-1]
-                else:
-                    # Take the first available candidate
-                    consecutive_slots = candidates[0]
+                if not ok or not consecutive_slots:
+                    continue
                 
+                # Score the candidate; on equal cost the earliest candidate is kept
+                day = consecutive_slots[0]['day']
+                cost = cost_prefix[i + event_duration] - cost_prefix[i]
+                for resource_name, weight in load_weights.items():
+                    cost += weight * load.get((resource_name, day), 0)
+                for resource_name, weight in gap_weights.items():
+                    gaps = gap_tables.get(resource_name)
+                    if gaps:
+                        # No booking yet that day gives None: no gap to pay for
+                        ends = [g for g in (gaps[i], gaps[i + event_duration - 1]) if g is not None]
+                        if ends:
+                            cost += weight * min(ends)
+                if best is None or cost < best_cost - COST_EPSILON:
+                    best = consecutive_slots
+                    best_cost = cost
+            
+            if best:
                 # Place the event
+                consecutive_slots = best
                 first_slot = consecutive_slots[0]
                 last_slot = consecutive_slots[-1]
                 for resource_name in evt['resources']:
@@ -578,6 +787,17 @@ class ScheduleGenerator:
                 # Mark all slots as used
                 for slot in consecutive_slots:
                     used_slots.add((slot['day'], slot['start'], slot['end']))
+                # Update load and gap tables of the booked resources
+                start_h = int(first_slot['start'].split(':')[0])
+                end_h = int(last_slot['end'].split(':')[0])
+                for resource_name in evt['resources']:
+                    key = (resource_name, first_slot['day'])
+                    load[key] = load.get(key, 0) + event_duration
+                    bookings.setdefault(key, []).append((start_h, end_h))
+                    gaps = gap_tables.setdefault(resource_name, [None] * len(slots_1h))
+                    for u in tables['day_slots'][first_slot['day']]:
+                        h = tables['hours'][u]
+                        gaps[u] = min(h - b_end if b_end <= h else max(b_start - (h + 1), 0) for b_start, b_end in bookings[key])
                 found = True
             
             if not found:
@@ -585,6 +805,72 @@ class ScheduleGenerator:
         
         return results, alerts
 
+    def build_slot_tables(self, slots_1h):
+        # Base cost of each 1-hour slot for the time-of-day and day-of-week preferences
+        hours = [int(slot['start'].split(':')[0]) for slot in slots_1h]
+        first = min(hours, default=0)
+        last = max(hours, default=0)
+        span = max(last - first, 1)
+        day_slots = {}
+        for u, slot in enumerate(slots_1h):
+            day_slots.setdefault(slot['day'], []).append(u)
+        on_day = {}
+        for day, units in day_slots.items():
+            on_day[day] = [0.0] * len(slots_1h)
+            for u in units:
+                on_day[day][u] = 1.0
+        return {
+            'hours': hours,
+            'day_slots': day_slots,
+            'early': [(h - first) / span for h in hours],
+            'late': [(last - h) / span for h in hours],
+            'on_day': on_day,
+        }
+
+    def constraint_applies(self, constraint, evt):
+        # A constraint targets all events, one event by name, or the events using a resource
+        target = constraint.get('target', ALL_EVENTS)
+        return target == ALL_EVENTS or target == evt['name'] or target in evt['resources']
+
+    def event_cost_prefix(self, evt, tables):
+        # Sum the weighted tables of every time preference that applies to the event
+        n = len(tables['hours'])
+        costs = [0.0] * n
+        for constraint in self.constraints:
+            if not self.constraint_applies(constraint, evt):
+                continue
+            type_ = constraint['type']
+            weight = float(constraint.get('weight', 1))
+            on_day = tables['on_day'].get(constraint.get('day'), [0.0] * n)
+            if type_ == 'Prefer early in the day':
+                table = tables['early']
+            elif type_ == 'Prefer late in the day':
+                table = tables['late']
+            elif type_ == 'Prefer day':
+                table = [1.0 - c for c in on_day]
+            elif type_ == 'Avoid day':
+                table = on_day
+            else:
+                continue
+            for u in range(n):
+                costs[u] += weight * table[u]
+        prefix = [0.0]
+        for c in costs:
+            prefix.append(prefix[-1] + c)
+        return prefix
+
+    def event_resource_weights(self, evt, type_):
+        # Total weight of a resource constraint for each resource of the event
+        weights = {}
+        for constraint in self.constraints:
+            if constraint['type'] != type_ or not self.constraint_applies(constraint, evt):
+                continue
+            target = constraint.get('target', ALL_EVENTS)
+            for resource_name in evt['resources']:
+                if target in (ALL_EVENTS, evt['name'], resource_name):
+                    weights[resource_name] = weights.get(resource_name, 0) + float(constraint.get('weight', 1))
+        return weights
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = ScheduleGeneratorApp(root)